@@ -5,11 +5,218 @@ Uses Claude 3.5 Sonnet to understand natural language planning queries
 and convert them to structured planning problems.
 """
 
+import asyncio
+import copy
+import hashlib
 import os
-import json
-from typing import Dict, List, Any, Optional, Tuple
-from anthropic import AsyncAnthropic
-from pop_solver.mcp_client import MCPClient
+import re
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Any, AsyncIterator, Optional, Tuple
+import orjson
+from pop_solver.mcp_client import get_mcp_client
+
+if TYPE_CHECKING:
+    # anthropic (and httpx under it) take ~0.5s to import, so they are only
+    # loaded when the first client is created
+    from anthropic import AsyncAnthropic
+
+
+# Static system prompts are kept at module level so their bytes stay identical
+# across calls, which is what Anthropic's prompt cache keys on.
+SYSTEM_PROMPT_PARSE = """You are a planning problem analyzer for a robot painting system.
+
+The robot painting domain has these elements:
+- Locations: Floor, Ladder
+- Objects: Robot, Ladder, Ceiling
+- States: Dry/Wet (¬Dry), Painted/Unpainted
+- Actions: climb-ladder, descend-ladder, paint-ceiling, paint-ladder
+
+Valid state conditions:
+- On(Robot, Floor) or On(Robot, Ladder)
+- Dry(Ladder) or ¬Dry(Ladder)
+- Dry(Ceiling) or ¬Dry(Ceiling)
+- Painted(Ladder)
+- Painted(Ceiling)
+
+Extract the following from the user's query:
+1. problem_type: Always "robot" (blockworld not implemented)
+2. current_state: List of current conditions (if not specified, use defaults)
+3. goals: List of goal conditions
+4. query_type: "plan" (create full plan) or "operator" (single action)
+5. operator: If query_type is "operator", which operator to apply
+
+Default starting state if not specified:
+["On(Robot, Floor)", "Dry(Ladder)", "Dry(Ceiling)"]
+
+Record these fields with the extract_planning_problem tool."""
+
+# Tool schema for parse_query - forcing this tool makes Claude return a typed
+# object instead of free text that has to be fished out of markdown fences
+PARSE_TOOL = {
+    "name": "extract_planning_problem",
+    "description": "Record the structured planning problem extracted from the user's query.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "problem_type": {
+                "type": "string",
+                "enum": ["robot"]
+            },
+            "current_state": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Current state conditions, e.g. On(Robot, Floor)"
+            },
+            "goals": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Goal conditions (empty if just applying an operator)"
+            },
+            "query_type": {
+                "type": "string",
+                "enum": ["plan", "operator"]
+            },
+            "operator": {
+                "type": ["string", "null"],
+                "enum": ["climb-ladder", "descend-ladder", "paint-ceiling", "paint-ladder", None],
+                "description": "Operator to apply if query_type is operator, null otherwise"
+            }
+        },
+        "required": ["problem_type", "current_state", "goals", "query_type", "operator"]
+    }
+}
+
+SYSTEM_PROMPT_FORMAT = """You are a helpful assistant explaining robot planning results.
+Format the technical planning output into clear, conversational language.
+Be concise but informative. Use numbered steps for plans."""
+
+
+# Anthropic clients keyed by a hash of the API key. Every client shares one httpx
+# connection pool, so reusing a key skips the TLS handshake and evicting a key
+# leaves no sockets behind. Sized to match the agent cache in pop_solver.app.
+_ANTHROPIC_CLIENTS: OrderedDict[str, "AsyncAnthropic"] = OrderedDict()
+_ANTHROPIC_CLIENTS_MAXSIZE = 8
+_HTTP_CLIENT = None
+
+
+def _get_anthropic_client(api_key: str) -> "AsyncAnthropic":
+    """Return the shared Anthropic client for an API key, creating it on first use"""
+    global _HTTP_CLIENT
+
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    client = _ANTHROPIC_CLIENTS.get(key_hash)
+    if client is not None:
+        _ANTHROPIC_CLIENTS.move_to_end(key_hash)
+        return client
+
+    import httpx
+    from anthropic import AsyncAnthropic
+
+    if _HTTP_CLIENT is None:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=2000, max_keepalive_connections=1500),
+            timeout=httpx.Timeout(120.0)
+        )
+    client = AsyncAnthropic(api_key=api_key, http_client=_HTTP_CLIENT)
+    _ANTHROPIC_CLIENTS[key_hash] = client
+    if len(_ANTHROPIC_CLIENTS) > _ANTHROPIC_CLIENTS_MAXSIZE:
+        # Evicted clients don't own the pool, so there is nothing to close
+        _ANTHROPIC_CLIENTS.popitem(last=False)
+    return client
+
+
+async def close_anthropic_clients():
+    """Drop all shared Anthropic clients and close their connection pool"""
+    global _HTTP_CLIENT
+
+    _ANTHROPIC_CLIENTS.clear()
+    http_client, _HTTP_CLIENT = _HTTP_CLIENT, None
+    if http_client is not None:
+        await http_client.aclose()
+
+
+# LRU cache of parse_query results keyed by normalized query text
+_PARSE_CACHE: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+_PARSE_CACHE_MAXSIZE = 1024
+
+# Seconds between status checks while waiting for a message batch to finish
+_BATCH_POLL_INTERVAL = 5.0
+# Longest wait for a message batch (which can take up to 24h) before cancelling it
+# and making its calls directly
+_BATCH_MAX_WAIT = 300.0
+
+# Body of the first markdown code fence in a text response (closing fence optional,
+# in case the response was cut off)
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.DOTALL)
+
+
+# Rule-based fast path for common phrasings that don't need Claude to classify
+_FAST_OPERATOR_RE = re.compile(
+    r"^what happens if the robot (?P<verb>climbs|descends|paints) the (?P<target>ladder|ceiling)\??$"
+)
+_FAST_PLAN_RE = re.compile(
+    r"^(?:the robot is on the (?P<position>floor|ladder),? (?:now )?)?"
+    r"(?:help the robot |the robot needs to )?"
+    r"paint (?:both )?the (?P<first>ceiling|ladder)(?: and the (?P<second>ceiling|ladder))?[.!]?$"
+)
+_FAST_OPERATORS = {
+    ("climbs", "ladder"): "climb-ladder",
+    ("descends", "ladder"): "descend-ladder",
+    ("paints", "ceiling"): "paint-ceiling",
+    ("paints", "ladder"): "paint-ladder",
+}
+
+
+# Values the robot planner accepts, checked locally so malformed parses fail
+# without a round-trip to the MCP server
+_VALID_OPERATORS = frozenset({"climb-ladder", "descend-ladder", "paint-ceiling", "paint-ladder"})
+_VALID_GOALS = frozenset({"Painted(Ceiling)", "Painted(Ladder)"})
+
+
+def _prevalidate(parsed: Dict[str, Any]) -> Optional[str]:
+    """Return an error message if a parsed query can't succeed, without calling the planner"""
+    if parsed.get("problem_type") != "robot":
+        return f"Error: Unsupported problem type: {parsed.get('problem_type')}"
+    if parsed.get("query_type") == "operator":
+        if parsed.get("operator") not in _VALID_OPERATORS:
+            return f"Error: Unknown operator: {parsed.get('operator')}"
+    elif not any(goal in _VALID_GOALS for goal in parsed.get("goals") or ()):
+        return f"Error: Goal conditions must include at least one of: {sorted(_VALID_GOALS)}"
+    return None
+
+
+def _try_fast_parse(query: str) -> Optional[Dict[str, Any]]:
+    """Parse a query matching a known phrasing without calling Claude, or return None"""
+    normalized = " ".join(query.lower().split())
+
+    match = _FAST_OPERATOR_RE.match(normalized)
+    if match and (match["verb"], match["target"]) in _FAST_OPERATORS:
+        return {
+            "problem_type": "robot",
+            "current_state": ["On(Robot, Floor)", "Dry(Ladder)", "Dry(Ceiling)"],
+            "goals": [],
+            "query_type": "operator",
+            "operator": _FAST_OPERATORS[(match["verb"], match["target"])]
+        }
+
+    match = _FAST_PLAN_RE.match(normalized)
+    if match:
+        position = "Ladder" if match["position"] == "ladder" else "Floor"
+        targets = [match["first"]] + ([match["second"]] if match["second"] else [])
+        return {
+            "problem_type": "robot",
+            "current_state": [f"On(Robot, {position})", "Dry(Ladder)", "Dry(Ceiling)"],
+            "goals": [f"Painted({target.capitalize()})" for target in dict.fromkeys(targets)],
+            "query_type": "plan",
+            "operator": None
+        }
+
+    return None
+
+
+def _cached_system(prompt: str) -> List[Dict[str, Any]]:
+    """Wrap a static system prompt in a text block marked for prompt caching"""
+    return [{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}]
 
 
 class PlanningAgent:
@@ -21,78 +228,73 @@ class PlanningAgent:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not provided or found in environment")
 
-        self.client = AsyncAnthropic(api_key=self.api_key)
+        self.client = _get_anthropic_client(self.api_key)
         # Using Claude Sonnet 4
         self.model = "claude-sonnet-4-20250514"
 
-    async def parse_query(self, user_query: str) -> Dict[str, Any]:
-        """Parse natural language query to extract planning elements"""
-        system_prompt = """You are a planning problem analyzer for a robot painting system.
-
-        The robot painting domain has these elements:
-        - Locations: Floor, Ladder
-        - Objects: Robot, Ladder, Ceiling
-        - States: Dry/Wet (¬Dry), Painted/Unpainted
-        - Actions: climb-ladder, descend-ladder, paint-ceiling, paint-ladder
-
-        Valid state conditions:
-        - On(Robot, Floor) or On(Robot, Ladder)
-        - Dry(Ladder) or ¬Dry(Ladder)
-        - Dry(Ceiling) or ¬Dry(Ceiling)
-        - Painted(Ladder)
-        - Painted(Ceiling)
-
-        Extract the following from the user's query:
-        1. problem_type: Always "robot" (blockworld not implemented)
-        2. current_state: List of current conditions (if not specified, use defaults)
-        3. goals: List of goal conditions
-        4. query_type: "plan" (create full plan) or "operator" (single action)
-        5. operator: If query_type is "operator", which operator to apply
-
-        Default starting state if not specified:
-        ["On(Robot, Floor)", "Dry(Ladder)", "Dry(Ceiling)"]
-
-        Return a JSON object with these fields."""
-
+    def _parse_request(self, user_query: str) -> Dict[str, Any]:
+        """Build the messages.create parameters used to parse a query"""
         user_prompt = f"""Parse this planning query: "{user_query}"
 
-        Return a JSON object with:
-        - problem_type: "robot"
-        - current_state: array of state conditions
-        - goals: array of goal conditions (empty if just applying operator)
-        - query_type: "plan" or "operator"
-        - operator: operator name if query_type is "operator", null otherwise
-
         Examples:
         "Help the robot paint the ceiling" -> plan to achieve Painted(Ceiling)
         "The robot needs to paint both the ceiling and ladder" -> plan for multiple goals
         "What happens if the robot climbs the ladder?" -> apply climb-ladder operator
         "Robot is on the ladder, paint the ceiling" -> plan from non-default state"""
 
-        response = await self.client.messages.create(
-            model=self.model,
-            max_tokens=500,
-            temperature=0,
-            system=system_prompt,
-            messages=[
+        return {
+            "model": self.model,
+            "max_tokens": 150,
+            "temperature": 0,
+            "system": _cached_system(SYSTEM_PROMPT_PARSE),
+            "tools": [PARSE_TOOL],
+            "tool_choice": {"type": "tool", "name": PARSE_TOOL["name"]},
+            "messages": [
                 {"role": "user", "content": user_prompt}
             ]
+        }
+
+    @staticmethod
+    def _read_parse_response(response) -> Optional[Dict[str, Any]]:
+        """Extract the parsed planning problem from a response, or None if it is unreadable"""
+        # Forced tool use returns the schema-shaped object directly
+        tool_input = next(
+            (block.input for block in response.content if getattr(block, "type", None) == "tool_use"),
+            None
         )
+        if tool_input is not None:
+            return dict(tool_input)
 
-        # Extract JSON from response
+        # Extract JSON from a plain text response
         response_text = response.content[0].text
+        match = _JSON_FENCE_RE.search(response_text)
+        json_str = match.group(1) if match else response_text.strip()
         try:
             # Try to parse the response as JSON
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = response_text.strip()
-
-            parsed = json.loads(json_str)
-            return parsed
-        except json.JSONDecodeError:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def _lookup_parse(user_query: str) -> Optional[Dict[str, Any]]:
+        """Return a parse from the fast path or the parse cache without calling Claude"""
+        if os.getenv("POP_FAST_PARSE") == "1":
+            fast_parsed = _try_fast_parse(user_query)
+            if fast_parsed is not None:
+                return fast_parsed
+
+        # Parsing is deterministic (temperature=0), so repeated queries can skip the API call
+        cache_key = user_query.strip().lower()
+        if cache_key in _PARSE_CACHE:
+            _PARSE_CACHE.move_to_end(cache_key)
+            return copy.deepcopy(_PARSE_CACHE[cache_key])
+
+        return None
+
+    @staticmethod
+    def _store_parse(user_query: str, parsed: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Cache a successful parse and return it, or return the fallback parse"""
+        if parsed is None:
             # Fallback to a simple plan query
             return {
                 "problem_type": "robot",
@@ -102,12 +304,22 @@ class PlanningAgent:
                 "operator": None
             }
 
-    async def format_response(self, result: str, query_type: str) -> str:
-        """Format planning results for human readability"""
-        system_prompt = """You are a helpful assistant explaining robot planning results.
-        Format the technical planning output into clear, conversational language.
-        Be concise but informative. Use numbered steps for plans."""
+        _PARSE_CACHE[user_query.strip().lower()] = copy.deepcopy(parsed)
+        if len(_PARSE_CACHE) > _PARSE_CACHE_MAXSIZE:
+            _PARSE_CACHE.popitem(last=False)
+        return parsed
+
+    async def parse_query(self, user_query: str) -> Dict[str, Any]:
+        """Parse natural language query to extract planning elements"""
+        parsed = self._lookup_parse(user_query)
+        if parsed is not None:
+            return parsed
+
+        response = await self.client.messages.create(**self._parse_request(user_query))
+        return self._store_parse(user_query, self._read_parse_response(response))
 
+    def _format_request(self, result: str, query_type: str) -> Dict[str, Any]:
+        """Build the messages.create parameters used to format a planning result"""
         if query_type == "plan":
             user_prompt = f"""Convert this planning result to human-readable format:
 
@@ -126,42 +338,77 @@ class PlanningAgent:
 
             Explain what happened when the operator was applied."""
 
-        response = await self.client.messages.create(
-            model=self.model,
-            max_tokens=500,
-            temperature=0,
-            system=system_prompt,
-            messages=[
+        return {
+            "model": self.model,
+            "max_tokens": 350,
+            "temperature": 0,
+            "system": _cached_system(SYSTEM_PROMPT_FORMAT),
+            "messages": [
                 {"role": "user", "content": user_prompt}
             ]
-        )
+        }
 
+    async def format_response(self, result: str, query_type: str) -> str:
+        """Format planning results for human readability"""
+        response = await self.client.messages.create(**self._format_request(result, query_type))
         return response.content[0].text
 
+    async def format_response_stream(self, result: str, query_type: str) -> AsyncIterator[str]:
+        """Format planning results for human readability, yielding text as it is generated"""
+        async with self.client.messages.stream(**self._format_request(result, query_type)) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+    @staticmethod
+    async def _run_tool(mcp_client, parsed: Dict[str, Any]) -> str:
+        """Call the MCP tool matching the parsed query type"""
+        if parsed["query_type"] == "operator":
+            # Apply single operator
+            return await mcp_client.call_tool("apply_operator_tool", {
+                "start_conditions": parsed["current_state"],
+                "operator": parsed["operator"],
+                "problem_type": parsed["problem_type"]
+            })
+
+        # Create plan
+        return await mcp_client.call_tool("create_plan_tool", {
+            "start_conditions": parsed["current_state"],
+            "goal_conditions": parsed["goals"],
+            "problem_type": parsed["problem_type"]
+        })
+
+    async def _solve(self, user_query: str) -> Tuple[Dict[str, Any], str, bool]:
+        """
+        Parse a query and run it against the MCP server.
+
+        Returns the parse, the raw result and whether the parse was rejected
+        locally, in which case the result is the error and there is nothing to format.
+        """
+        # Parse the query while the shared MCP client is fetched (and started on
+        # first use), since the two are independent of each other
+        parsed, mcp_client = await asyncio.gather(
+            self.parse_query(user_query),
+            get_mcp_client()
+        )
+
+        error = _prevalidate(parsed)
+        if error is not None:
+            return parsed, error, True
+
+        # Execute against the long-lived MCP server
+        result = await self._run_tool(mcp_client, parsed)
+        return parsed, result, False
+
     async def process_query(self, user_query: str) -> Dict[str, Any]:
         """Process a natural language query end-to-end"""
-        # Parse the query
-        parsed = await self.parse_query(user_query)
-
-        # Connect to MCP server and execute
-        async with MCPClient() as mcp_client:
-            if parsed["query_type"] == "operator":
-                # Apply single operator
-                result = await mcp_client.call_tool("apply_operator_tool", {
-                    "start_conditions": parsed["current_state"],
-                    "operator": parsed["operator"],
-                    "problem_type": parsed["problem_type"]
-                })
-            else:
-                # Create plan
-                result = await mcp_client.call_tool("create_plan_tool", {
-                    "start_conditions": parsed["current_state"],
-                    "goal_conditions": parsed["goals"],
-                    "problem_type": parsed["problem_type"]
-                })
+        parsed, result, rejected = await self._solve(user_query)
 
-        # Format the response
-        formatted = await self.format_response(result, parsed["query_type"])
+        # Format the response - its prompt embeds the tool result, so this is the
+        # one step that can't overlap with the others
+        if rejected:
+            formatted = result
+        else:
+            formatted = await self.format_response(result, parsed["query_type"])
 
         return {
             "query": user_query,
@@ -171,6 +418,149 @@ class PlanningAgent:
             "success": not result.startswith("Error:")
         }
 
+    async def process_query_stream(self, user_query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a natural language query end-to-end, streaming the formatted answer.
+
+        Yields a "result" event with the parse and raw planner output once the
+        tool has run, then "text" events as the formatted answer is generated.
+        """
+        parsed, result, rejected = await self._solve(user_query)
+
+        yield {
+            "type": "result",
+            "query": user_query,
+            "parsed": parsed,
+            "raw_result": result,
+            "success": not result.startswith("Error:")
+        }
+
+        if rejected:
+            yield {"type": "text", "text": result}
+            return
+
+        async for text in self.format_response_stream(result, parsed["query_type"]):
+            yield {"type": "text", "text": text}
+
+    def _batches_api(self):
+        """Return the Message Batches resource for the installed SDK, or None if unavailable"""
+        batches = getattr(self.client.messages, "batches", None)
+        if batches is None:
+            batches = getattr(getattr(self.client, "beta", None), "messages", None)
+            batches = getattr(batches, "batches", None)
+        return batches
+
+    async def _run_batch(self, batches, requests: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Submit messages.create parameters as one batch and return succeeded messages by custom_id.
+
+        A batch still running after _BATCH_MAX_WAIT seconds is cancelled and yields
+        no messages, leaving callers to make every call in it directly.
+        """
+        if not requests:
+            return {}
+
+        batch = await batches.create(requests=[
+            {"custom_id": custom_id, "params": params} for custom_id, params in requests.items()
+        ])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _BATCH_MAX_WAIT
+        while batch.processing_status != "ended":
+            if loop.time() >= deadline:
+                try:
+                    await batches.cancel(batch.id)
+                except Exception as e:
+                    print(f"Failed to cancel message batch {batch.id}: {e}")
+                return {}
+            await asyncio.sleep(_BATCH_POLL_INTERVAL)
+            batch = await batches.retrieve(batch.id)
+
+        messages = {}
+        async for entry in await batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                messages[entry.custom_id] = entry.result.message
+        return messages
+
+    async def _parse_batch(self, batches, user_queries: List[str]) -> List[Dict[str, Any]]:
+        """Parse queries, sending everything the fast path and cache can't answer as one batch"""
+        parsed_queries = [self._lookup_parse(q) for q in user_queries]
+        pending = [i for i, parsed in enumerate(parsed_queries) if parsed is None]
+        messages = await self._run_batch(batches, {
+            f"parse-{i}": self._parse_request(user_queries[i]) for i in pending
+        })
+
+        retry = []
+        for i in pending:
+            message = messages.get(f"parse-{i}")
+            if message is None:
+                retry.append(i)
+            else:
+                parsed_queries[i] = self._store_parse(user_queries[i], self._read_parse_response(message))
+
+        # Individual batch entries can fail (or the whole batch time out) - retry those directly
+        retried = await asyncio.gather(*(self.parse_query(user_queries[i]) for i in retry))
+        for i, parsed in zip(retry, retried):
+            parsed_queries[i] = parsed
+        return parsed_queries
+
+    async def process_queries(self, user_queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process several natural language queries, sending their Claude calls as Message Batches.
+
+        Batches are billed at a discount and scale better for bulk submissions, at
+        the cost of latency. Falls back to processing the queries concurrently if
+        the installed SDK has no batches API.
+        """
+        batches = self._batches_api()
+        if batches is None:
+            return list(await asyncio.gather(*(self.process_query(q) for q in user_queries)))
+
+        mcp_client_task = asyncio.create_task(get_mcp_client())
+        try:
+            parsed_queries = await self._parse_batch(batches, user_queries)
+        finally:
+            # Collect the MCP client even if parsing failed, so the task's outcome is
+            # always retrieved. It isn't cancelled, since that could orphan a
+            # half-started server process.
+            await asyncio.gather(mcp_client_task, return_exceptions=True)
+        mcp_client = mcp_client_task.result()
+
+        # Rejected parses keep their error as the result; the rest run against the server
+        errors = [_prevalidate(parsed) for parsed in parsed_queries]
+        valid = [i for i, error in enumerate(errors) if error is None]
+        results = list(errors)
+        tool_results = await asyncio.gather(*(self._run_tool(mcp_client, parsed_queries[i]) for i in valid))
+        for i, result in zip(valid, tool_results):
+            results[i] = result
+
+        # Format all results in a second batch
+        format_messages = await self._run_batch(batches, {
+            f"format-{i}": self._format_request(results[i], parsed_queries[i]["query_type"]) for i in valid
+        })
+        formatted = list(errors)
+        retry = []
+        for i in valid:
+            message = format_messages.get(f"format-{i}")
+            if message is None:
+                retry.append(i)
+            else:
+                formatted[i] = message.content[0].text
+        retried = await asyncio.gather(*(
+            self.format_response(results[i], parsed_queries[i]["query_type"]) for i in retry
+        ))
+        for i, text in zip(retry, retried):
+            formatted[i] = text
+
+        return [
+            {
+                "query": q,
+                "parsed": parsed_queries[i],
+                "raw_result": results[i],
+                "formatted_result": formatted[i],
+                "success": not results[i].startswith("Error:")
+            }
+            for i, q in enumerate(user_queries)
+        ]
 
 async def test_agent():
     """Test the planning agent with sample queries"""
@@ -195,5 +585,4 @@ async def test_agent():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(test_agent())
\ No newline at end of file
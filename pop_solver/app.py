@@ -1,15 +1,60 @@
+import asyncio
+import contextlib
+import functools
 import os
+from contextlib import asynccontextmanager
+import orjson
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from typing import Optional
+from typing import List, Optional
+
+from pop_solver.mcp_client import get_mcp_client, close_mcp_client
 
 load_dotenv()
 
+
+async def _warm_claude():
+    """Send a throwaway parse so the TLS connection and prompt cache are primed"""
+    try:
+        agent = _get_agent(None)
+        await agent.parse_query("warmup: paint ceiling")
+    except Exception as e:
+        # Not fatal - the connection is set up lazily on the first query instead
+        print(f"Claude warmup failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the shared MCP server and Claude client on startup and release shared clients on shutdown"""
+    # Claude can take minutes to answer when overloaded, so warm it in the
+    # background rather than holding up startup
+    claude_warmup = asyncio.create_task(_warm_claude())
+    try:
+        await get_mcp_client()
+    except Exception as e:
+        # Not fatal - the server is started lazily on the first query instead
+        print(f"MCP client warmup failed: {e}")
+
+    yield
+
+    claude_warmup.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await claude_warmup
+
+    await close_mcp_client()
+    _get_agent.cache_clear()
+
+    from pop_solver.agent import close_anthropic_clients
+    await close_anthropic_clients()
+
+
 app = FastAPI(
     title="Partial Order Planning Solver",
     description="A FastAPI service for partial order planning with natural language interface",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 @app.get("/")
@@ -35,6 +80,12 @@ class PlanningQuery(BaseModel):
     api_key: Optional[str] = None  # Optional API key override
 
 
+class BatchPlanningQuery(BaseModel):
+    """Request model for batches of planning queries"""
+    queries: List[str]
+    api_key: Optional[str] = None  # Optional API key override
+
+
 class PlanningResponse(BaseModel):
     """Response model for planning queries"""
     query: str
@@ -43,6 +94,15 @@ class PlanningResponse(BaseModel):
     details: Optional[dict] = None
 
 
+@functools.lru_cache(maxsize=8)
+def _get_agent(api_key: Optional[str]):
+    """Return a shared PlanningAgent per API key override (None uses the environment key)"""
+    # Import here to avoid circular dependencies and only load when needed
+    from pop_solver.agent import PlanningAgent
+
+    return PlanningAgent(api_key=api_key)
+
+
 @app.post("/solve", response_model=PlanningResponse)
 async def solve_planning_problem(request: PlanningQuery):
     """
@@ -54,11 +114,8 @@ async def solve_planning_problem(request: PlanningQuery):
     - "What happens if the robot climbs the ladder?"
     """
     try:
-        # Import here to avoid circular dependencies and only load when needed
-        from pop_solver.agent import PlanningAgent
-
-        # Initialize agent with optional API key override
-        agent = PlanningAgent(api_key=request.api_key)
+        # Reuse the agent for this API key override
+        agent = _get_agent(request.api_key)
 
         # Process the query
         result = await agent.process_query(request.query)
@@ -78,4 +135,67 @@ async def solve_planning_problem(request: PlanningQuery):
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Unexpected error
-        raise HTTPException(status_code=500, detail=f"Failed to process query: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to process query: {str(e)}")
+
+def _sse_event(event: str, data: dict) -> bytes:
+    """Frame a server-sent event with a JSON payload"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+@app.post("/solve_stream")
+async def solve_planning_problem_stream(request: PlanningQuery):
+    """
+    Process a natural language planning query, streaming the answer as server-sent events.
+
+    Emits a "result" event with the parsed query and raw planner output, "text"
+    events carrying chunks of the formatted answer, then a final "done" event
+    (or an "error" event if processing fails part way through).
+    """
+    try:
+        agent = _get_agent(request.api_key)
+    except ValueError as e:
+        # Missing API key or configuration error
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        try:
+            async for event in agent.process_query_stream(request.query):
+                yield _sse_event(event.pop("type"), event)
+            yield _sse_event("done", {})
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            yield _sse_event("error", {"detail": f"Failed to process query: {str(e)}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/solve_batch", response_model=List[PlanningResponse])
+async def solve_planning_batch(request: BatchPlanningQuery):
+    """
+    Process several natural language planning queries at once.
+
+    The Claude calls for all queries are submitted through the Message Batches
+    API, so this suits bulk workloads rather than interactive use.
+    """
+    try:
+        agent = _get_agent(request.api_key)
+        results = await agent.process_queries(request.queries)
+
+        return [
+            PlanningResponse(
+                query=result["query"],
+                success=result["success"],
+                result=result["formatted_result"],
+                details={
+                    "parsed": result["parsed"],
+                    "raw_result": result["raw_result"]
+                }
+            )
+            for result in results
+        ]
+    except ValueError as e:
+        # Missing API key or configuration error
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        # Unexpected error
+        raise HTTPException(status_code=500, detail=f"Failed to process queries: {str(e)}")
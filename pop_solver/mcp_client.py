@@ -2,41 +2,123 @@
 MCP Client for communication with local planning server
 
 Handles STDIO-based communication with the MCP server subprocess.
+Setting POP_MCP_TRANSPORT=uds talks to the server over a unix socketpair instead.
 """
 
 import asyncio
-import json
+import os
+import socket
 import subprocess
 import sys
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
+import orjson
+
+
+# LRU cache of successful tool results keyed by (tool name, canonical JSON arguments)
+_TOOL_RESULT_CACHE: OrderedDict[Tuple[str, bytes], str] = OrderedDict()
+_TOOL_RESULT_CACHE_MAXSIZE = 512
+
 
 class MCPClient:
     """Client for communicating with MCP server via STDIO transport"""
 
-    def __init__(self):
+    def __init__(self, transport: Optional[str] = None):
+        # "stdio" (default), "uds" for a unix socketpair handed to the server, or
+        # "inproc" to dispatch straight to the FastMCP instance in this process
+        self.transport = transport or os.getenv("POP_MCP_TRANSPORT", "stdio")
         self.process: Optional[subprocess.Popen] = None
+        self._inproc_server = None
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
         self._request_id = 0
+        # Responses are demultiplexed by id onto these futures by the reader task,
+        # so concurrent callers can have requests in flight at the same time
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_tail: deque = deque(maxlen=50)
+        self._stderr_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the server subprocess is started, has not exited, and its output is still being read"""
+        if self.transport == "inproc":
+            return self._inproc_server is not None
+        # Once the reader stops (EOF, or a line over the stream limit) every request
+        # fails, even if the process itself is still alive
+        return (
+            self.process is not None
+            and self.process.returncode is None
+            and self._reader_task is not None
+            and not self._reader_task.done()
+        )
 
     async def start(self):
         """Start the MCP server subprocess and establish STDIO communication"""
+        if self.transport == "inproc":
+            from pop_solver.mcp_server import mcp
+            self._inproc_server = mcp
+            return
+
         # Get the path to the MCP server script
         server_path = Path(__file__).parent / "mcp_server.py"
 
-        # Start the MCP server as a subprocess
-        self.process = await asyncio.create_subprocess_exec(
-            sys.executable, str(server_path),
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        if self.transport == "uds":
+            # The server speaks JSON-RPC on its end of the socketpair (passed as an
+            # inherited fd), which also keeps planner prints on stdout off the wire
+            parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                self.process = await asyncio.create_subprocess_exec(
+                    sys.executable, str(server_path),
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                    pass_fds=(child_sock.fileno(),),
+                    env={**os.environ, "POP_MCP_FD": str(child_sock.fileno())}
+                )
+            finally:
+                child_sock.close()
+            self.reader, self.writer = await asyncio.open_unix_connection(sock=parent_sock)
+        elif self.transport == "stdio":
+            # Start the MCP server as a subprocess
+            self.process = await asyncio.create_subprocess_exec(
+                sys.executable, str(server_path),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            self.reader, self.writer = self.process.stdout, self.process.stdin
+        else:
+            raise ValueError(f"Unknown MCP transport: {self.transport!r}")
+
+        # Keep draining stderr so a long-lived server never blocks on a full pipe
+        self._stderr_tail.clear()
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+
+        # Route responses to their waiting requests as they arrive
+        self._reader_task = asyncio.create_task(self._reader_loop())
 
         # Initialize the connection
         await self._initialize_connection()
 
+    async def _drain_stderr(self):
+        """Read server stderr continuously, keeping only the most recent lines"""
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                break
+            self._stderr_tail.append(line)
+
+    async def _stderr_output(self) -> str:
+        """Return recent stderr output, waiting briefly for an exiting server to flush it"""
+        try:
+            await asyncio.wait_for(asyncio.shield(self._stderr_task), timeout=1.0)
+        except asyncio.TimeoutError:
+            pass
+        return b"".join(self._stderr_tail).decode(errors="replace")
+
     async def _initialize_connection(self):
         """Initialize the JSONRPC connection with the server"""
         # Send initialize request
@@ -57,43 +139,91 @@ class MCPClient:
         # Mark as initialized
         await self._send_notification("notifications/initialized", {})
 
+    async def _reader_loop(self):
+        """Read server output and resolve the pending request matching each response id"""
+        error = ConnectionError("MCP server closed connection")
+        try:
+            while True:
+                response_line = await self.reader.readline()
+                if not response_line:
+                    # Check if there's any stderr output
+                    stderr = await self._stderr_output()
+                    error = ConnectionError(f"MCP server returned empty response. Stderr: {stderr or 'None'}")
+                    break
+
+                try:
+                    response = orjson.loads(response_line)
+                except orjson.JSONDecodeError:
+                    # Stray non-protocol output (e.g. prints from the server process)
+                    # can't be matched to a request, so skip it
+                    continue
+
+                # Notifications and server-initiated requests have no pending future
+                future = self._pending.pop(response.get("id"), None) if isinstance(response, dict) else None
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def _inproc_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a request from the in-process server in the same shape as a JSONRPC response"""
+        if method == "tools/list":
+            tools = await self._inproc_server.list_tools()
+            return {"result": {"tools": [tool.model_dump(by_alias=True, exclude_none=True) for tool in tools]}}
+
+        if method == "tools/call":
+            from mcp.server.fastmcp.exceptions import ToolError
+
+            try:
+                content = await self._inproc_server.call_tool(params["name"], params["arguments"])
+            except ToolError as e:
+                # The stdio server reports tool failures as error results, not JSONRPC errors
+                return {"result": {"content": [{"type": "text", "text": str(e)}], "isError": True}}
+
+            # Tools with an output schema also return their structured content
+            if isinstance(content, tuple):
+                content = content[0]
+            return {"result": {
+                "content": [block.model_dump(by_alias=True, exclude_none=True) for block in content],
+                "isError": False
+            }}
+
+        return {"error": {"code": -32601, "message": f"Method not found: {method}"}}
+
     async def _send_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Send a JSONRPC request and wait for response"""
+        if self.transport == "inproc":
+            if self._inproc_server is None:
+                raise ConnectionError("MCP server closed connection")
+            return await self._inproc_request(method, params)
+
+        if self._reader_task is None or self._reader_task.done():
+            raise ConnectionError("MCP server closed connection")
+
         self._request_id += 1
+        request_id = self._request_id
         request = {
             "jsonrpc": "2.0",
             "method": method,
             "params": params,
-            "id": self._request_id
+            "id": request_id
         }
 
-        # Send request
-        request_str = json.dumps(request) + "\n"
-        self.process.stdin.write(request_str.encode())
-        await self.process.stdin.drain()
-
-        # Read response
-        response_line = await self.process.stdout.readline()
-        if not response_line:
-            # Check if there's any stderr output
-            stderr = await self.process.stderr.read(1024)
-            raise ConnectionError(f"MCP server returned empty response. Stderr: {stderr.decode() if stderr else 'None'}")
-
+        # Register before writing so a fast response always finds its future
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
         try:
-            response = json.loads(response_line.decode())
-        except json.JSONDecodeError as e:
-            raise ConnectionError(f"Invalid JSON response from MCP server: {response_line.decode()!r}. Error: {e}")
-
-        # Handle response
-        if response.get("id") != self._request_id:
-            # This might be a notification or different response, keep reading
-            while response.get("id") != self._request_id:
-                response_line = await self.process.stdout.readline()
-                if not response_line:
-                    raise ConnectionError("MCP server closed connection")
-                response = json.loads(response_line.decode())
+            # Send request
+            self.writer.write(orjson.dumps(request) + b"\n")
+            await self.writer.drain()
 
-        return response
+            # Wait for the reader task to deliver the matching response
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
 
     async def _send_notification(self, method: str, params: Dict[str, Any]):
         """Send a JSONRPC notification (no response expected)"""
@@ -103,12 +233,18 @@ class MCPClient:
             "params": params
         }
 
-        notification_str = json.dumps(notification) + "\n"
-        self.process.stdin.write(notification_str.encode())
-        await self.process.stdin.drain()
+        self.writer.write(orjson.dumps(notification) + b"\n")
+        await self.writer.drain()
 
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """Call an MCP tool and return the result"""
+        # Planning tools are pure functions of their arguments, so successful
+        # results can be served without a round-trip to the server
+        cache_key = (tool_name, orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS))
+        if cache_key in _TOOL_RESULT_CACHE:
+            _TOOL_RESULT_CACHE.move_to_end(cache_key)
+            return _TOOL_RESULT_CACHE[cache_key]
+
         response = await self._send_request("tools/call", {
             "name": tool_name,
             "arguments": arguments
@@ -123,7 +259,12 @@ class MCPClient:
 
         # For text responses, extract the text content
         if content and isinstance(content, list) and content[0].get("type") == "text":
-            return content[0].get("text", "")
+            text = content[0].get("text", "")
+            if not result.get("isError") and not text.startswith("Error:"):
+                _TOOL_RESULT_CACHE[cache_key] = text
+                if len(_TOOL_RESULT_CACHE) > _TOOL_RESULT_CACHE_MAXSIZE:
+                    _TOOL_RESULT_CACHE.popitem(last=False)
+            return text
 
         return content
 
@@ -138,6 +279,7 @@ class MCPClient:
 
     async def close(self):
         """Close the connection and terminate the subprocess"""
+        self._inproc_server = None
         if self.process:
             # Send close notification
             try:
@@ -153,7 +295,20 @@ class MCPClient:
                 self.process.kill()
                 await self.process.wait()
 
+            if self._reader_task:
+                self._reader_task.cancel()
+                self._reader_task = None
+
+            if self._stderr_task:
+                self._stderr_task.cancel()
+                self._stderr_task = None
+
+            if self.transport == "uds" and self.writer is not None:
+                self.writer.close()
+
             self.process = None
+            self.reader = None
+            self.writer = None
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -165,6 +320,60 @@ class MCPClient:
         await self.close()
 
 
+_mcp_client_singleton: Optional[MCPClient] = None
+_mcp_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_mcp_client_lock: Optional[asyncio.Lock] = None
+
+
+async def get_mcp_client() -> MCPClient:
+    """
+    Return the shared long-lived MCP client, starting it on first use.
+
+    The server subprocess is reused across queries so each tool call only pays
+    for a stdin write and stdout read. The client is restarted transparently if
+    its subprocess has exited or its connection was lost, or if it was started
+    on a different event loop.
+    """
+    global _mcp_client_singleton, _mcp_client_loop, _mcp_client_lock
+
+    loop = asyncio.get_running_loop()
+    if _mcp_client_loop is not loop:
+        # Pipes are bound to the loop that created them, so a client left over
+        # from another loop can't be reused - kill it and start over
+        stale_process = _mcp_client_singleton.process if _mcp_client_singleton is not None else None
+        if stale_process is not None and stale_process.returncode is None:
+            try:
+                stale_process.kill()
+            except Exception:
+                pass
+        _mcp_client_singleton = None
+        _mcp_client_loop = loop
+        _mcp_client_lock = asyncio.Lock()
+
+    async with _mcp_client_lock:
+        if _mcp_client_singleton is None or not _mcp_client_singleton.is_running:
+            if _mcp_client_singleton is not None:
+                # A server that lost its connection may still be alive - don't leave it behind
+                try:
+                    await _mcp_client_singleton.close()
+                except Exception:
+                    pass
+            client = MCPClient()
+            await client.start()
+            _mcp_client_singleton = client
+
+    return _mcp_client_singleton
+
+
+async def close_mcp_client():
+    """Close the shared MCP client if it has been started"""
+    global _mcp_client_singleton
+
+    client, _mcp_client_singleton = _mcp_client_singleton, None
+    if client is not None:
+        await client.close()
+
+
 async def test_mcp_client():
     """Test function to verify MCP client functionality"""
     async with MCPClient() as client:
@@ -4,9 +4,10 @@ MCP Server for Partial Order Planning Solver
 Exposes planning functions as MCP tools via STDIO transport for local agent integration.
 """
 
+import asyncio
+import os
 from typing import List
 from mcp.server.fastmcp import FastMCP
-from pop_solver.planning.planning_solving_functions import apply_operator, create_plan
 
 # Initialize FastMCP server
 mcp = FastMCP("partial-order-planning-solver")
@@ -37,6 +38,9 @@ async def apply_operator_tool(
 
     Note: Currently has known bug where result state equals start state, but precondition validation works correctly.
     """
+    # Imported on first call so the stdio initialize handshake doesn't wait on it
+    from pop_solver.planning.planning_solving_functions import apply_operator
+
     try:
         result = apply_operator(start_conditions, operator, problem_type)
         return result
@@ -74,6 +78,8 @@ async def create_plan_tool(
     Raises:
         LookupError: When goal conditions cannot be achieved (converted to error string)
     """
+    from pop_solver.planning.planning_solving_functions import create_plan
+
     try:
         result = create_plan(start_conditions, goal_conditions, problem_type)
         return result
@@ -89,6 +95,35 @@ async def create_plan_tool(
         return f"Error: {str(e)}"
 
 
+async def run_fd_transport(fd: int) -> None:
+    """Run the server over an inherited socket fd (POP_MCP_TRANSPORT=uds) instead of stdin/stdout"""
+    from io import TextIOWrapper
+    import anyio
+    from mcp.server.stdio import stdio_server
+
+    # The stdio transport only needs line-oriented text files, so hand it both
+    # directions of the socket wrapped the same way it wraps stdin/stdout
+    sock_in = anyio.wrap_file(TextIOWrapper(os.fdopen(fd, "rb"), encoding="utf-8", errors="replace"))
+    sock_out = anyio.wrap_file(TextIOWrapper(os.fdopen(os.dup(fd), "wb"), encoding="utf-8"))
+    async with stdio_server(stdin=sock_in, stdout=sock_out) as (read_stream, write_stream):
+        await mcp._mcp_server.run(
+            read_stream,
+            write_stream,
+            mcp._mcp_server.create_initialization_options(),
+        )
+
+
 if __name__ == "__main__":
-    # Start the MCP server with STDIO transport for local container execution
-    mcp.run(transport='stdio')
\ No newline at end of file
+    # Run the stdio loop on uvloop where available (not supported on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    if "POP_MCP_FD" in os.environ:
+        # Socketpair set up by MCPClient when POP_MCP_TRANSPORT=uds
+        asyncio.run(run_fd_transport(int(os.environ["POP_MCP_FD"])))
+    else:
+        # Start the MCP server with STDIO transport for local container execution
+        mcp.run(transport='stdio')
\ No newline at end of file
@@ -1,4 +1,5 @@
 # Concrete implementation for Robot Painting
+import functools
 import json
 from typing import List, Dict
 
@@ -9,20 +10,29 @@ from pop_solver.planning.state.state import State
 import os
 
 
+@functools.lru_cache(maxsize=None)
+def _load_operators(json_filepath: str) -> Dict[str, 'Operator']:
+    """Parse an operator JSON file once - planners are built per call, but the operator definitions never change"""
+    with open(json_filepath, 'r') as file:
+        data = json.load(file)  # Load the JSON file
+
+    operators = {}
+    for op_data in data:
+        name = op_data['name']
+        preconditions = op_data['preconditions']
+        postconditions = op_data['postconditions']
+        operator = RobotPaintingOperator(name, preconditions, postconditions)
+        operators[name] = operator
+    return operators
+
+
 class RobotPaintingPlanner(Planner):
     def _generate_operators(self) -> Dict[str, 'Operator']:
         json_filepath = str(self._get_json_filepath())  # Get the JSON file path from the subclass
 
-        with open(json_filepath, 'r') as file:
-            data = json.load(file)  # Load the JSON file
-
-        operators = {}
-        for op_data in data:
-            name = op_data['name']
-            preconditions = op_data['preconditions']
-            postconditions = op_data['postconditions']
-            operator = RobotPaintingOperator(name, preconditions, postconditions)
-            operators[name] = operator
+        # Operators are only read during planning, so instances can share them; the
+        # dict itself is copied so each planner still owns its table
+        operators = dict(_load_operators(json_filepath))
 
         print(f"Loaded operator for {self.__class__.__name__}: {operators}")
         return operators
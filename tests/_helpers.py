@@ -0,0 +1,29 @@
+"""
+Shared helpers for the test suite
+"""
+
+# Planning inputs shared across test modules
+ROBOT_START = ('On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)')
+PAINT_GOAL = ('Painted(Ceiling)',)
+MULTI_GOAL = ('Painted(Ceiling)', 'Painted(Ladder)')
+
+
+async def parity(mcp_coro, direct_fn, *args):
+    """Return (MCP tool result, direct function result) for the same planning arguments"""
+    mcp_result = await mcp_coro
+    # Planner calls finish in well under a millisecond, so handing the direct call to
+    # asyncio.to_thread would cost more than it overlaps
+    direct_result = direct_fn(*args)
+    return mcp_result, direct_result
+
+
+def stub_create(response):
+    """Plain async stand-in for messages.create that returns response and records call kwargs"""
+    calls = []
+
+    async def create(*args, **kwargs):
+        calls.append(kwargs)
+        return response
+
+    create.calls = calls
+    return create
@@ -2,27 +2,120 @@
 Test configuration and fixtures for pytest
 """
 
+import asyncio
 import pytest
+import pytest_asyncio
 import sys
 import os
+from unittest.mock import AsyncMock, patch
 
 # Add the project root to Python path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from pop_solver.mcp_client import MCPClient
+from tests._helpers import MULTI_GOAL, PAINT_GOAL, ROBOT_START
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_planner():
+    """Plan once per session (per xdist worker) so one-time operator loading stays out of test timings"""
+    from pop_solver.planning.planning_solving_functions import create_plan
+
+    create_plan(ROBOT_START, ['Painted(Ladder)'], 'robot')
+
+
+@pytest.fixture(autouse=True)
+def clear_result_caches():
+    """Start every test with empty tool result and parse caches, so no test is answered from another's results"""
+    from pop_solver import agent, mcp_client
+
+    mcp_client._TOOL_RESULT_CACHE.clear()
+    agent._PARSE_CACHE.clear()
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """One event loop per test module, so module-scoped async fixtures outlive a single test"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def mcp_client():
+    """MCP client shared by every test in a module, dispatching to the server in-process"""
+    async with MCPClient(transport="inproc") as client:
+        yield client
+
+
+@pytest.fixture
+def vcr_config():
+    """Keep API credentials out of recorded cassettes"""
+    return {"filter_headers": ["authorization", "x-api-key"]}
+
+
+def _missing_cassette(record_mode, vcr_cassette_dir, default_cassette_name):
+    """True when VCR would replay a test's cassette but none has been recorded"""
+    cassette = os.path.join(vcr_cassette_dir, f"{default_cassette_name}.yaml")
+    return record_mode == "none" and not os.path.exists(cassette)
+
+
+@pytest.fixture
+def disable_recording(request, record_mode, vcr_cassette_dir, default_cassette_name):
+    """Let real-API tests without a recorded cassette run live when an API key is set"""
+    if request.config.getoption("--disable-recording"):
+        return True
+    return (
+        request.node.get_closest_marker("vcr") is not None
+        and bool(os.getenv("ANTHROPIC_API_KEY"))
+        and _missing_cassette(record_mode, vcr_cassette_dir, default_cassette_name)
+    )
+
+
+@pytest.fixture
+def anthropic_cassette(record_mode, vcr_cassette_dir, default_cassette_name, monkeypatch):
+    """
+    Replay a test's recorded Anthropic traffic from tests/cassettes/.
+
+    Without a cassette the test runs live against the API if ANTHROPIC_API_KEY
+    is set, and is skipped otherwise. Record (or re-record after prompt changes)
+    with ANTHROPIC_API_KEY set and --record-mode=once (or new_episodes).
+    """
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        if _missing_cassette(record_mode, vcr_cassette_dir, default_cassette_name):
+            pytest.skip("ANTHROPIC_API_KEY not set and no recorded cassette")
+        # Replayed requests never reach the API, but agents still require a key
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "replayed-api-key")
+
+
+@pytest_asyncio.fixture(scope="module")
+async def fastapi_client():
+    """Async HTTP client for the API on the test's event loop, running app startup and shutdown once per module"""
+    import httpx
+    from pop_solver.app import app
+
+    # ASGITransport doesn't run the lifespan itself, so enter it around the client.
+    # The Claude warm-up would be a live, paid request outside any cassette, so
+    # only the MCP client is warmed.
+    with patch("pop_solver.app._warm_claude", AsyncMock()):
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                yield client
+
 
 @pytest.fixture
 def sample_robot_start_state():
     """Standard robot starting state for tests"""
-    return ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)']
+    return ROBOT_START
 
 
 @pytest.fixture
 def sample_paint_ceiling_goal():
     """Standard goal to paint ceiling"""
-    return ['Painted(Ceiling)']
+    return PAINT_GOAL
 
 
 @pytest.fixture
 def sample_paint_both_goal():
     """Goal to paint both ceiling and ladder"""
-    return ['Painted(Ceiling)', 'Painted(Ladder)']
\ No newline at end of file
+    return MULTI_GOAL
\ No newline at end of file
@@ -0,0 +1,443 @@
+"""
+Integration tests for Phase 3: Natural Language Planning Agent
+
+Tests parsing, formatting and end-to-end processing of natural language queries.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch, MagicMock
+from pop_solver.agent import PlanningAgent, SYSTEM_PROMPT_FORMAT, _JSON_FENCE_RE, close_anthropic_clients
+from tests._helpers import stub_create
+
+# Claude model to use for testing
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+# Parse returned by fake message batches
+BATCH_PARSE = {
+    "problem_type": "robot",
+    "current_state": ["On(Robot, Floor)", "Dry(Ladder)", "Dry(Ceiling)"],
+    "goals": [],
+    "query_type": "operator",
+    "operator": "climb-ladder"
+}
+
+
+def fake_batches(pending_polls=0, failed=()):
+    """
+    Mocked Message Batches resource answering parse and format requests.
+
+    Each batch reports in_progress for its first pending_polls statuses (counting
+    the one create returns) before it ends, and entries whose custom_id is in
+    failed come back errored.
+    """
+    submitted = []
+    polls = {}
+
+    def status(batch_id):
+        remaining = polls[batch_id]
+        polls[batch_id] = remaining - 1
+        return "ended" if remaining <= 0 else "in_progress"
+
+    async def create(requests):
+        submitted.append(requests)
+        batch_id = f"batch-{len(submitted)}"
+        polls[batch_id] = pending_polls
+        return MagicMock(id=batch_id, processing_status=status(batch_id))
+
+    async def retrieve(batch_id):
+        return MagicMock(id=batch_id, processing_status=status(batch_id))
+
+    async def results(batch_id):
+        async def entries():
+            for request in submitted[-1]:
+                custom_id = request["custom_id"]
+                if custom_id in failed:
+                    yield MagicMock(custom_id=custom_id, result=MagicMock(type="errored"))
+                    continue
+                if custom_id.startswith("parse-"):
+                    content = [MagicMock(type="tool_use", input=dict(BATCH_PARSE))]
+                else:
+                    content = [MagicMock(text="The robot climbed the ladder.")]
+                yield MagicMock(
+                    custom_id=custom_id,
+                    result=MagicMock(type="succeeded", message=MagicMock(content=content))
+                )
+        return entries()
+
+    batches = MagicMock()
+    batches.create = AsyncMock(side_effect=create)
+    batches.retrieve = AsyncMock(side_effect=retrieve)
+    batches.results = AsyncMock(side_effect=results)
+    batches.cancel = AsyncMock()
+    batches.submitted = submitted
+    return batches
+
+
+class TestPlanningAgent:
+    """Test the planning agent with natural language processing"""
+
+    @pytest.fixture
+    def mock_api_key(self):
+        """Provide mock API key for testing"""
+        return "test-api-key"
+
+    @pytest.fixture
+    def mocked_agent(self, mock_api_key):
+        """PlanningAgent with a mocked Anthropic client and no API key validation"""
+        with patch.object(PlanningAgent, '__init__', lambda x, api_key: None):
+            agent = PlanningAgent(api_key=mock_api_key)
+            agent.api_key = mock_api_key
+            agent.model = CLAUDE_MODEL
+            agent.client = AsyncMock()
+            yield agent
+
+    @pytest.mark.asyncio
+    async def test_agents_share_anthropic_client(self, mock_api_key):
+        """Test agents with the same API key reuse one Anthropic client"""
+        try:
+            first = PlanningAgent(api_key=mock_api_key)
+            second = PlanningAgent(api_key=mock_api_key)
+            other = PlanningAgent(api_key="other-api-key")
+
+            assert first.client is second.client
+            assert first.client is not other.client
+        finally:
+            await close_anthropic_clients()
+
+    @pytest.mark.asyncio
+    async def test_anthropic_client_cache_is_bounded(self):
+        """Test per-key clients are evicted least recently used first and share one connection pool"""
+        from pop_solver import agent as agent_module
+
+        try:
+            clients = [
+                agent_module._get_anthropic_client(f"api-key-{i}")
+                for i in range(agent_module._ANTHROPIC_CLIENTS_MAXSIZE + 1)
+            ]
+
+            assert len(agent_module._ANTHROPIC_CLIENTS) == agent_module._ANTHROPIC_CLIENTS_MAXSIZE
+            assert agent_module._get_anthropic_client("api-key-0") is not clients[0]
+            assert all(client._client is clients[0]._client for client in clients)
+        finally:
+            await close_anthropic_clients()
+
+    @pytest.mark.asyncio
+    async def test_agent_parse_simple_goal(self, mocked_agent):
+        """Test parsing simple goal query"""
+        agent = mocked_agent
+
+        # Mock Anthropic client
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text='''```json
+        {
+            "problem_type": "robot",
+            "current_state": ["On(Robot, Floor)", "Dry(Ladder)", "Dry(Ceiling)"],
+            "goals": ["Painted(Ceiling)"],
+            "query_type": "plan",
+            "operator": null
+        }
+        ```''')]
+
+        agent.client.messages.create = stub_create(mock_response)
+        # The stubbed payload is fenced, so it must go through the fence regex
+        assert _JSON_FENCE_RE.search(mock_response.content[0].text)
+
+        parsed = await agent.parse_query("Help the robot paint the ceiling")
+
+        assert parsed["problem_type"] == "robot"
+        assert parsed["query_type"] == "plan"
+        assert "Painted(Ceiling)" in parsed["goals"]
+        assert parsed["operator"] is None
+
+    @pytest.mark.asyncio
+    async def test_agent_parse_operator_query(self, mocked_agent):
+        """Test parsing operator application query"""
+        agent = mocked_agent
+
+        # Mock Anthropic client
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text='''```json
+        {
+            "problem_type": "robot",
+            "current_state": ["On(Robot, Floor)", "Dry(Ladder)", "Dry(Ceiling)"],
+            "goals": [],
+            "query_type": "operator",
+            "operator": "climb-ladder"
+        }
+        ```''')]
+
+        agent.client.messages.create = stub_create(mock_response)
+        # The stubbed payload is fenced, so it must go through the fence regex
+        assert _JSON_FENCE_RE.search(mock_response.content[0].text)
+
+        parsed = await agent.parse_query("What happens if the robot climbs the ladder?")
+
+        assert parsed["problem_type"] == "robot"
+        assert parsed["query_type"] == "operator"
+        assert parsed["operator"] == "climb-ladder"
+        assert len(parsed["goals"]) == 0
+
+    @pytest.mark.asyncio
+    async def test_agent_parse_tool_use_response(self, mocked_agent):
+        """Test parsing reads the forced tool call input"""
+        agent = mocked_agent
+
+        # Mock Anthropic client
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(type="tool_use", input={
+            "problem_type": "robot",
+            "current_state": ["On(Robot, Ladder)", "Dry(Ladder)", "Dry(Ceiling)"],
+            "goals": [],
+            "query_type": "operator",
+            "operator": "descend-ladder"
+        })]
+
+        agent.client.messages.create = stub_create(mock_response)
+
+        parsed = await agent.parse_query("What happens if the robot climbs down the ladder?")
+
+        assert parsed["query_type"] == "operator"
+        assert parsed["operator"] == "descend-ladder"
+        call_kwargs = agent.client.messages.create.calls[-1]
+        assert call_kwargs["tool_choice"] == {"type": "tool", "name": "extract_planning_problem"}
+
+    @pytest.mark.asyncio
+    async def test_agent_fast_parse_skips_claude(self, mock_api_key, monkeypatch):
+        """Test known phrasings are parsed locally when POP_FAST_PARSE is enabled"""
+        monkeypatch.setenv("POP_FAST_PARSE", "1")
+        with patch.object(PlanningAgent, '__init__', lambda x, api_key: None):
+            agent = PlanningAgent(api_key=mock_api_key)
+            agent.client = AsyncMock()
+
+            parsed = await agent.parse_query("The robot is on the ladder, now paint the ceiling")
+            assert parsed["query_type"] == "plan"
+            assert parsed["current_state"] == ["On(Robot, Ladder)", "Dry(Ladder)", "Dry(Ceiling)"]
+            assert parsed["goals"] == ["Painted(Ceiling)"]
+
+            parsed = await agent.parse_query("What happens if the robot climbs the ladder?")
+            assert parsed["query_type"] == "operator"
+            assert parsed["operator"] == "climb-ladder"
+
+            agent.client.messages.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_agent_parse_query_is_cached(self, mocked_agent):
+        """Test repeated queries are served from the parse cache"""
+        agent = mocked_agent
+
+        # Mock Anthropic client
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text='''{
+            "problem_type": "robot",
+            "current_state": ["On(Robot, Floor)", "Dry(Ladder)", "Dry(Ceiling)"],
+            "goals": ["Painted(Ladder)"],
+            "query_type": "plan",
+            "operator": null
+        }''')]
+
+        agent.client.messages.create = stub_create(mock_response)
+
+        first = await agent.parse_query("Cache test: paint the ladder")
+        first["goals"].append("Painted(Ceiling)")  # Mutating a result must not leak into the cache
+        second = await agent.parse_query("  cache test: PAINT the ladder ")
+
+        assert len(agent.client.messages.create.calls) == 1
+        assert second["goals"] == ["Painted(Ladder)"]
+
+    @pytest.mark.asyncio
+    async def test_agent_format_response(self, mocked_agent):
+        """Test formatting planning results"""
+        agent = mocked_agent
+
+        # Mock Anthropic client
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text="""To paint the ceiling, the robot needs to:
+1. Climb the ladder (from floor to ladder)
+2. Paint the ceiling (while on the ladder)
+
+The robot will end up on the ladder with the ceiling painted.""")]
+
+        agent.client.messages.create = stub_create(mock_response)
+
+        plan_result = "[Plan with climb-ladder and paint-ceiling]"
+        formatted = await agent.format_response(plan_result, "plan")
+
+        assert "climb" in formatted.lower() or "ladder" in formatted.lower()
+        assert "paint" in formatted.lower() or "ceiling" in formatted.lower()
+
+    @pytest.mark.asyncio
+    async def test_agent_system_prompt_is_cacheable(self, mocked_agent):
+        """Test static system prompt is sent as a cache_control text block"""
+        agent = mocked_agent
+
+        # Mock Anthropic client
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text="The robot climbed the ladder.")]
+
+        agent.client.messages.create = stub_create(mock_response)
+
+        await agent.format_response("[Operator result]", "operator")
+
+        system = agent.client.messages.create.calls[-1]["system"]
+        assert system[0]["text"] == SYSTEM_PROMPT_FORMAT
+        assert system[0]["cache_control"] == {"type": "ephemeral"}
+
+    @pytest.mark.asyncio
+    async def test_agent_process_query_reuses_shared_client(self, mock_api_key):
+        """Test process_query calls tools on the shared MCP client without closing it"""
+        with patch.object(PlanningAgent, '__init__', lambda x, api_key: None):
+            agent = PlanningAgent(api_key=mock_api_key)
+            agent.parse_query = AsyncMock(return_value={
+                "problem_type": "robot",
+                "current_state": ["On(Robot, Floor)", "Dry(Ladder)", "Dry(Ceiling)"],
+                "goals": [],
+                "query_type": "operator",
+                "operator": "climb-ladder"
+            })
+            agent.format_response = AsyncMock(return_value="The robot climbed the ladder.")
+
+            mock_mcp_client = AsyncMock()
+            mock_mcp_client.call_tool = AsyncMock(return_value="[Operator result]")
+            with patch('pop_solver.agent.get_mcp_client', AsyncMock(return_value=mock_mcp_client)):
+                result = await agent.process_query("What happens if the robot climbs the ladder?")
+
+            assert result["success"] is True
+            assert mock_mcp_client.call_tool.call_args.args[0] == "apply_operator_tool"
+            mock_mcp_client.close.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_agent_process_query_rejects_unknown_operator(self, mock_api_key):
+        """Test invalid parsed operators fail without calling the MCP server or Claude"""
+        with patch.object(PlanningAgent, '__init__', lambda x, api_key: None):
+            agent = PlanningAgent(api_key=mock_api_key)
+            agent.parse_query = AsyncMock(return_value={
+                "problem_type": "robot",
+                "current_state": ["On(Robot, Floor)", "Dry(Ladder)", "Dry(Ceiling)"],
+                "goals": [],
+                "query_type": "operator",
+                "operator": "jump"
+            })
+            agent.format_response = AsyncMock()
+
+            mock_mcp_client = AsyncMock()
+            with patch('pop_solver.agent.get_mcp_client', AsyncMock(return_value=mock_mcp_client)):
+                result = await agent.process_query("What happens if the robot jumps?")
+
+            assert result["success"] is False
+            assert "Unknown operator: jump" in result["formatted_result"]
+            mock_mcp_client.call_tool.assert_not_called()
+            agent.format_response.assert_not_called()
+
+    @pytest.fixture
+    def batch_agent(self, mock_api_key):
+        """PlanningAgent with a mocked client whose direct create calls are tracked"""
+        with patch.object(PlanningAgent, '__init__', lambda x, api_key: None):
+            agent = PlanningAgent(api_key=mock_api_key)
+            agent.model = CLAUDE_MODEL
+            agent.client = MagicMock()
+            agent.client.messages.create = AsyncMock()
+            yield agent
+
+    @pytest.fixture
+    def batch_mcp_client(self):
+        """Shared MCP client stand-in for process_queries tests"""
+        mock_mcp_client = AsyncMock()
+        mock_mcp_client.call_tool = AsyncMock(return_value="[Operator result]")
+        with patch('pop_solver.agent.get_mcp_client', AsyncMock(return_value=mock_mcp_client)) as get_client:
+            yield get_client
+
+    @pytest.mark.asyncio
+    async def test_agent_process_queries_uses_message_batches(self, batch_agent, batch_mcp_client):
+        """Test process_queries sends parse and format calls as two message batches"""
+        batches = fake_batches()
+        batch_agent.client.messages.batches = batches
+
+        queries = ["Climb the ladder, robot", "Robot, go up the ladder"]
+        results = await batch_agent.process_queries(queries)
+
+        assert [r["query"] for r in results] == queries
+        assert all(r["formatted_result"] == "The robot climbed the ladder." for r in results)
+        assert [len(requests) for requests in batches.submitted] == [2, 2]
+        batch_agent.client.messages.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_agent_process_queries_polls_until_batch_ends(self, batch_agent, batch_mcp_client, monkeypatch):
+        """Test process_queries keeps retrieving a batch until its processing has ended"""
+        monkeypatch.setattr('pop_solver.agent._BATCH_POLL_INTERVAL', 0)
+        batches = fake_batches(pending_polls=2)
+        batch_agent.client.messages.batches = batches
+
+        results = await batch_agent.process_queries(["Climb the ladder, robot"])
+
+        assert results[0]["formatted_result"] == "The robot climbed the ladder."
+        # Each of the two batches is created in progress, still running at the first
+        # retrieve and ended at the second
+        assert batches.retrieve.await_count == 4
+        batches.cancel.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_agent_process_queries_retries_failed_batch_entries(self, batch_agent, batch_mcp_client):
+        """Test batch entries that didn't succeed are retried with direct calls"""
+        batch_agent.client.messages.batches = fake_batches(failed={"parse-1", "format-0"})
+        batch_agent.parse_query = AsyncMock(return_value=dict(BATCH_PARSE))
+        batch_agent.format_response = AsyncMock(return_value="Formatted directly.")
+
+        results = await batch_agent.process_queries(["Climb the ladder, robot", "Robot, go up the ladder"])
+
+        batch_agent.parse_query.assert_awaited_once_with("Robot, go up the ladder")
+        batch_agent.format_response.assert_awaited_once_with("[Operator result]", "operator")
+        assert [r["formatted_result"] for r in results] == ["Formatted directly.", "The robot climbed the ladder."]
+
+    @pytest.mark.asyncio
+    async def test_agent_process_queries_cancels_overdue_batch(self, batch_agent, batch_mcp_client, monkeypatch):
+        """Test a batch still running at the deadline is cancelled and its calls made directly"""
+        monkeypatch.setattr('pop_solver.agent._BATCH_MAX_WAIT', 0)
+        batches = fake_batches(pending_polls=1)
+        batch_agent.client.messages.batches = batches
+        batch_agent.parse_query = AsyncMock(return_value=dict(BATCH_PARSE))
+        batch_agent.format_response = AsyncMock(return_value="Formatted directly.")
+
+        results = await batch_agent.process_queries(["Climb the ladder, robot"])
+
+        assert results[0]["formatted_result"] == "Formatted directly."
+        assert batches.cancel.await_count == 2
+        batches.results.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_agent_process_queries_without_batches_api(self, batch_agent):
+        """Test process_queries falls back to concurrent process_query calls if the SDK has no batches API"""
+        batch_agent.client.messages = MagicMock(spec=["create"])
+        batch_agent.client.beta = None
+        batch_agent.process_query = AsyncMock(side_effect=lambda q: {"query": q})
+
+        results = await batch_agent.process_queries(["first", "second"])
+
+        assert results == [{"query": "first"}, {"query": "second"}]
+        assert batch_agent.process_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_agent_process_queries_waits_for_mcp_client_on_parse_failure(self, batch_agent, batch_mcp_client):
+        """Test a failed parse batch still collects the MCP client start it overlapped with"""
+        batches = fake_batches()
+        batches.create = AsyncMock(side_effect=RuntimeError("batch submit failed"))
+        batch_agent.client.messages.batches = batches
+
+        with pytest.raises(RuntimeError, match="batch submit failed"):
+            await batch_agent.process_queries(["Climb the ladder, robot"])
+
+        batch_mcp_client.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.vcr
+    async def test_agent_end_to_end_with_real_api(self, anthropic_cassette):
+        """Test complete agent pipeline against recorded real API responses"""
+        agent = PlanningAgent()
+
+        result = await agent.process_query("Help the robot paint the ceiling")
+
+        assert result["success"] is True
+        assert "query" in result
+        assert "parsed" in result
+        assert "raw_result" in result
+        assert "formatted_result" in result
+        assert len(result["formatted_result"]) > 0
@@ -0,0 +1,170 @@
+"""
+Integration tests for Phase 3: MCP client
+
+Tests STDIO (and unix socket) communication between the MCP client and the
+planning server subprocess.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock
+from pop_solver.mcp_client import MCPClient, get_mcp_client, close_mcp_client
+from pop_solver.planning.planning_solving_functions import apply_operator
+from tests._helpers import ROBOT_START, PAINT_GOAL
+
+
+class TestMCPClient:
+    """Test MCP client STDIO communication"""
+
+    @pytest.mark.asyncio
+    async def test_mcp_client_initialization(self):
+        """Test MCP client can connect to server"""
+        client = MCPClient()
+        await client.start()
+
+        # Verify process is running
+        assert client.process is not None
+        assert client.process.returncode is None  # Process still running
+
+        await client.close()
+        assert client.process is None
+
+    @pytest.mark.asyncio
+    async def test_get_mcp_client_reuses_running_client(self):
+        """Test shared MCP client is reused and restarted after its process exits"""
+        try:
+            client = await get_mcp_client()
+            assert await get_mcp_client() is client
+
+            # Simulate the server dying - next lookup should start a new one
+            client.process.kill()
+            await client.process.wait()
+            restarted = await get_mcp_client()
+            assert restarted is not client
+            assert restarted.is_running
+        finally:
+            await close_mcp_client()
+
+    @pytest.mark.asyncio
+    async def test_get_mcp_client_restarts_after_reader_stops(self):
+        """Test shared MCP client is restarted when its connection is lost but the process lives on"""
+        try:
+            client = await get_mcp_client()
+            stale_process = client.process
+
+            # Simulate the reader giving up, e.g. on a response line over the stream limit
+            client._reader_task.cancel()
+            await asyncio.gather(client._reader_task, return_exceptions=True)
+            assert stale_process.returncode is None
+            assert not client.is_running
+
+            restarted = await get_mcp_client()
+            assert restarted is not client
+            assert restarted.is_running
+            # The stale server is shut down rather than left running
+            assert stale_process.returncode is not None
+        finally:
+            await close_mcp_client()
+
+    @pytest.mark.asyncio
+    async def test_mcp_client_list_tools(self, mcp_client):
+        """Test listing available MCP tools"""
+        tools = await mcp_client.list_tools()
+
+        # Check both tools are available
+        tool_names = [tool['name'] for tool in tools]
+        assert 'apply_operator_tool' in tool_names
+        assert 'create_plan_tool' in tool_names
+
+    @pytest.mark.asyncio
+    async def test_mcp_client_call_apply_operator(self, mcp_client):
+        """Test calling apply_operator through MCP client"""
+        result = await mcp_client.call_tool("apply_operator_tool", {
+            "start_conditions": ROBOT_START,
+            "operator": "climb-ladder",
+            "problem_type": "robot"
+        })
+
+        assert isinstance(result, str)
+        assert "climb-ladder" in result
+
+    @pytest.mark.asyncio
+    async def test_mcp_client_call_create_plan(self, mcp_client):
+        """Test calling create_plan through MCP client"""
+        result = await mcp_client.call_tool("create_plan_tool", {
+            "start_conditions": ROBOT_START,
+            "goal_conditions": PAINT_GOAL,
+            "problem_type": "robot"
+        })
+
+        assert isinstance(result, str)
+        assert "Painted(Ceiling)" in result
+
+    @pytest.mark.asyncio
+    async def test_mcp_client_error_handling(self, mcp_client):
+        """Test MCP client handles errors gracefully"""
+        # Test with invalid operator
+        result = await mcp_client.call_tool("apply_operator_tool", {
+            "start_conditions": ["On(Robot, Floor)"],
+            "operator": "invalid-operator",
+            "problem_type": "robot"
+        })
+
+        assert isinstance(result, str)
+        # Should get error message but not crash
+        assert "Error" in result or "not found" in result.lower()
+
+    @pytest.mark.asyncio
+    async def test_mcp_client_concurrent_requests(self):
+        """Test concurrent requests on one client each get their own response"""
+        async with MCPClient() as client:
+            tools, result = await asyncio.gather(
+                client.list_tools(),
+                client.call_tool("apply_operator_tool", {
+                    "start_conditions": ["On(Robot, Ladder)", "Dry(Ladder)", "Dry(Ceiling)"],
+                    "operator": "descend-ladder",
+                    "problem_type": "robot"
+                })
+            )
+
+            assert 'apply_operator_tool' in [tool['name'] for tool in tools]
+            assert "descend-ladder" in result
+
+    @pytest.mark.asyncio
+    async def test_mcp_client_uds_transport(self):
+        """Test the client talks to the server over a unix socketpair when requested"""
+        ladder_start = ('On(Robot, Ladder)', 'Dry(Ladder)', 'Painted(Ceiling)')
+        async with MCPClient(transport="uds") as client:
+            tools = await client.list_tools()
+            # Arguments no other test uses, so the call can't be answered from the result cache
+            result = await client.call_tool("apply_operator_tool", {
+                "start_conditions": ladder_start,
+                "operator": "paint-ceiling",
+                "problem_type": "robot"
+            })
+
+            assert 'create_plan_tool' in [tool['name'] for tool in tools]
+            assert result == apply_operator(ladder_start, "paint-ceiling", "robot")
+
+    @pytest.mark.asyncio
+    async def test_mcp_client_caches_successful_tool_results(self):
+        """Test repeated tool calls are cached, but error results are not"""
+        def text_response(text):
+            return {"result": {"content": [{"type": "text", "text": text}]}}
+
+        client = MCPClient()
+        client._send_request = AsyncMock(side_effect=[
+            text_response("[Plan for cache test]"),
+            text_response("Error: cache test failure"),
+            text_response("Error: cache test failure"),
+        ])
+
+        arguments = {"goal_conditions": ["Cache(Test)"], "start_conditions": ["On(Robot, Floor)"]}
+        assert await client.call_tool("create_plan_tool", arguments) == "[Plan for cache test]"
+        # Same arguments in a different key order hit the cache
+        assert await client.call_tool("create_plan_tool", dict(reversed(arguments.items()))) == "[Plan for cache test]"
+        assert client._send_request.await_count == 1
+
+        await client.call_tool("apply_operator_tool", arguments)
+        await client.call_tool("apply_operator_tool", arguments)
+        assert client._send_request.await_count == 3
@@ -6,107 +6,55 @@ return identical outputs to direct function calls.
 """
 
 import pytest
-import asyncio
+import pytest_asyncio
 from pop_solver.mcp_server import mcp, apply_operator_tool, create_plan_tool
 from pop_solver.planning.planning_solving_functions import apply_operator, create_plan
+from tests._helpers import MULTI_GOAL, PAINT_GOAL, ROBOT_START, parity
 
 
 class TestMCPServerTools:
     """Test MCP server tool functionality and output parity with direct functions"""
 
     @pytest.mark.asyncio
-    async def test_apply_operator_tool_climb_ladder(self):
+    @pytest.mark.parametrize("start_conditions,operator,problem_type,expected", [
+        pytest.param(ROBOT_START, 'climb-ladder', 'robot', None, id="climb_ladder"),
+        pytest.param(ROBOT_START, 'invalid-operator', 'robot', None, id="invalid_operator"),
+        # paint-ceiling requires the robot on the ladder
+        pytest.param(ROBOT_START, 'paint-ceiling', 'robot', None, id="failed_precondition"),
+        # The direct function raises here, so the MCP tool's error string is checked instead
+        pytest.param(ROBOT_START, 'climb-ladder', 'blockworld',
+                     "Error: Blockworld planner not implemented", id="blockworld_error"),
+    ])
+    async def test_apply_operator_tool_parity(self, start_conditions, operator, problem_type, expected):
         """Test apply_operator MCP tool returns identical output to direct function"""
-        start_conditions = ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)']
-        operator = 'climb-ladder'
-        problem_type = 'robot'
-
-        # Get results from both MCP tool and direct function
-        mcp_result = await apply_operator_tool(start_conditions, operator, problem_type)
-        direct_result = apply_operator(start_conditions, operator, problem_type)
-
-        # Results should be identical
-        assert mcp_result == direct_result
-
-    @pytest.mark.asyncio
-    async def test_apply_operator_tool_invalid_operator(self):
-        """Test apply_operator MCP tool error handling for invalid operator"""
-        start_conditions = ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)']
-        operator = 'invalid-operator'
-        problem_type = 'robot'
-
-        # Get results from both MCP tool and direct function
-        mcp_result = await apply_operator_tool(start_conditions, operator, problem_type)
-        direct_result = apply_operator(start_conditions, operator, problem_type)
-
-        # Results should be identical
-        assert mcp_result == direct_result
-
-    @pytest.mark.asyncio
-    async def test_apply_operator_tool_failed_precondition(self):
-        """Test apply_operator MCP tool error handling for failed preconditions"""
-        start_conditions = ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)']
-        operator = 'paint-ceiling'  # Requires robot on ladder
-        problem_type = 'robot'
+        if expected is not None:
+            mcp_result = await apply_operator_tool(start_conditions, operator, problem_type)
+            assert mcp_result == expected
+            return
 
         # Get results from both MCP tool and direct function
-        mcp_result = await apply_operator_tool(start_conditions, operator, problem_type)
-        direct_result = apply_operator(start_conditions, operator, problem_type)
+        mcp_result, direct_result = await parity(
+            apply_operator_tool(start_conditions, operator, problem_type),
+            apply_operator, start_conditions, operator, problem_type
+        )
 
         # Results should be identical
         assert mcp_result == direct_result
 
     @pytest.mark.asyncio
-    async def test_apply_operator_tool_blockworld_error(self):
-        """Test apply_operator MCP tool error handling for blockworld problem type"""
-        start_conditions = ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)']
-        operator = 'climb-ladder'
-        problem_type = 'blockworld'
-
-        # MCP tool should handle ValueError and return error string
-        mcp_result = await apply_operator_tool(start_conditions, operator, problem_type)
-
-        # Should return blockworld error message
-        assert mcp_result == "Error: Blockworld planner not implemented"
-
-    @pytest.mark.asyncio
-    async def test_create_plan_tool_paint_ceiling(self):
+    @pytest.mark.parametrize("start_conditions,goal_conditions,problem_type", [
+        pytest.param(ROBOT_START, PAINT_GOAL, 'robot', id="paint_ceiling"),
+        pytest.param(ROBOT_START, MULTI_GOAL, 'robot', id="multiple_goals"),
+        pytest.param(['Invalid(Condition)'], PAINT_GOAL, 'robot', id="invalid_start_conditions"),
+        pytest.param(ROBOT_START, PAINT_GOAL, 'blockworld', id="blockworld_error"),
+    ])
+    async def test_create_plan_tool_parity(self, start_conditions, goal_conditions, problem_type):
         """Test create_plan MCP tool returns identical output to direct function"""
-        start_conditions = ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)']
-        goal_conditions = ['Painted(Ceiling)']
-        problem_type = 'robot'
-
         # Get results from both MCP tool and direct function
-        mcp_result = await create_plan_tool(start_conditions, goal_conditions, problem_type)
-        direct_result = create_plan(start_conditions, goal_conditions, problem_type)
-
-        # Results should be identical
-        assert mcp_result == direct_result
-
-    @pytest.mark.asyncio
-    async def test_create_plan_tool_multiple_goals(self):
-        """Test create_plan MCP tool with multiple goals"""
-        start_conditions = ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)']
-        goal_conditions = ['Painted(Ceiling)', 'Painted(Ladder)']
-        problem_type = 'robot'
-
-        # Get results from both MCP tool and direct function
-        mcp_result = await create_plan_tool(start_conditions, goal_conditions, problem_type)
-        direct_result = create_plan(start_conditions, goal_conditions, problem_type)
-
-        # Results should be identical
-        assert mcp_result == direct_result
-
-    @pytest.mark.asyncio
-    async def test_create_plan_tool_invalid_start_conditions(self):
-        """Test create_plan MCP tool error handling for invalid start conditions"""
-        start_conditions = ['Invalid(Condition)']
-        goal_conditions = ['Painted(Ceiling)']
-        problem_type = 'robot'
-
-        # Get results from both MCP tool and direct function
-        mcp_result = await create_plan_tool(start_conditions, goal_conditions, problem_type)
-        direct_result = create_plan(start_conditions, goal_conditions, problem_type)
+        mcp_result, direct_result = await parity(
+            create_plan_tool(start_conditions, goal_conditions, problem_type),
+            create_plan, start_conditions, goal_conditions, problem_type
+        )
 
         # Results should be identical
         assert mcp_result == direct_result
@@ -114,7 +62,7 @@ class TestMCPServerTools:
     @pytest.mark.asyncio
     async def test_create_plan_tool_invalid_goal_conditions(self):
         """Test create_plan MCP tool handles LookupError for invalid goals"""
-        start_conditions = ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)']
+        start_conditions = ROBOT_START
         goal_conditions = ['Invalid(Goal)']
         problem_type = 'robot'
 
@@ -125,20 +73,6 @@ class TestMCPServerTools:
         assert mcp_result.startswith("Error:")
         assert "No operator found with postconditions matching the goal condition 'Invalid(Goal)'" in mcp_result
 
-    @pytest.mark.asyncio
-    async def test_create_plan_tool_blockworld_error(self):
-        """Test create_plan MCP tool error handling for blockworld problem type"""
-        start_conditions = ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)']
-        goal_conditions = ['Painted(Ceiling)']
-        problem_type = 'blockworld'
-
-        # Get results from both MCP tool and direct function
-        mcp_result = await create_plan_tool(start_conditions, goal_conditions, problem_type)
-        direct_result = create_plan(start_conditions, goal_conditions, problem_type)
-
-        # Results should be identical
-        assert mcp_result == direct_result
-
 
 class TestMCPServerStructure:
     """Test MCP server structure and tool registration"""
@@ -148,22 +82,21 @@ class TestMCPServerStructure:
         assert mcp is not None
         assert hasattr(mcp, 'run')
 
-    @pytest.mark.asyncio
-    async def test_tools_are_registered(self):
-        """Test that both tools are registered with the MCP server"""
-        # Get list of registered tools
+    @pytest_asyncio.fixture(scope="class")
+    async def registered_tools(self):
+        """Tools registered with the MCP server, keyed by name"""
         tools = await mcp.list_tools()
-        tool_names = [tool.name for tool in tools]
+        return {tool.name: tool for tool in tools}
 
+    def test_tools_are_registered(self, registered_tools):
+        """Test that both tools are registered with the MCP server"""
         # Both tools should be registered
-        assert 'apply_operator_tool' in tool_names
-        assert 'create_plan_tool' in tool_names
+        assert 'apply_operator_tool' in registered_tools
+        assert 'create_plan_tool' in registered_tools
 
-    @pytest.mark.asyncio
-    async def test_apply_operator_tool_schema(self):
+    def test_apply_operator_tool_schema(self, registered_tools):
         """Test apply_operator_tool has proper schema definition"""
-        tools = await mcp.list_tools()
-        apply_tool = next(tool for tool in tools if tool.name == 'apply_operator_tool')
+        apply_tool = registered_tools['apply_operator_tool']
 
         # Check tool has required fields
         assert hasattr(apply_tool, 'description')
@@ -175,11 +108,9 @@ class TestMCPServerStructure:
         assert 'operator' in properties
         assert 'problem_type' in properties
 
-    @pytest.mark.asyncio
-    async def test_create_plan_tool_schema(self):
+    def test_create_plan_tool_schema(self, registered_tools):
         """Test create_plan_tool has proper schema definition"""
-        tools = await mcp.list_tools()
-        plan_tool = next(tool for tool in tools if tool.name == 'create_plan_tool')
+        plan_tool = registered_tools['create_plan_tool']
 
         # Check tool has required fields
         assert hasattr(plan_tool, 'description')
@@ -2,9 +2,61 @@
 Test suite for planning solving functions
 """
 
+import re
+
 import pytest
 from pop_solver.planning.planning_solving_functions import apply_operator, create_plan
-from pop_solver.planning.planner.instances.robot_painting_planner import RobotPaintingPlanner
+from tests._helpers import MULTI_GOAL, PAINT_GOAL, ROBOT_START
+
+# Robot on the ladder with everything dry, shared by several cases
+_LADDER_DRY = ('On(Robot, Ladder)', 'Dry(Ladder)', 'Dry(Ceiling)')
+
+_INVALID_GOAL_RE = re.compile(r"No operator found with postconditions matching the goal condition 'Invalid\(Goal\)'\.")
+
+# (start conditions, operator) for apply_operator on the robot problem. Expected outputs
+# are stored as snapshots in __snapshots__/test_planning_functions.ambr
+APPLY_CASES = [
+    # apply_operator with climb-ladder (actual output)
+    pytest.param(ROBOT_START, 'climb-ladder', id="apply_operator_climb_ladder"),
+    # apply_operator with missing ceiling condition
+    pytest.param(['On(Robot, Floor)', 'Dry(Ladder)'], 'climb-ladder', id="apply_operator_missing_ceiling_condition"),
+    # apply_operator with invalid operator
+    pytest.param(ROBOT_START, 'invalid-operator', id="apply_operator_invalid_operator"),
+    # descend-ladder operator - (note: state not updating, potential bug)
+    pytest.param(_LADDER_DRY, 'descend-ladder', id="apply_descend_ladder"),
+    # paint-ceiling operator from ladder (should work)
+    pytest.param(_LADDER_DRY, 'paint-ceiling', id="apply_paint_ceiling_from_ladder"),
+    # paint-ceiling operator from floor (should fail)
+    pytest.param(ROBOT_START, 'paint-ceiling', id="apply_paint_ceiling_from_floor"),
+    # climb-ladder when robot already on ladder (should fail)
+    pytest.param(_LADDER_DRY, 'climb-ladder', id="apply_climb_when_on_ladder"),
+    # climbing painted ladder (should fail)
+    pytest.param(['On(Robot, Floor)', 'Painted(Ladder)', 'Dry(Ceiling)'], 'climb-ladder', id="climb_painted_ladder"),
+    # climbing ladder that is not dry (should fail)
+    pytest.param(['On(Robot, Floor)', '¬Dry(Ladder)', 'Dry(Ceiling)'], 'climb-ladder', id="climb_not_dry_ladder"),
+    # descending painted ladder (should fail)
+    pytest.param(['On(Robot, Ladder)', 'Painted(Ladder)', 'Dry(Ceiling)'], 'descend-ladder', id="descend_painted_ladder"),
+    # painting ceiling that is already painted - allows repainting
+    pytest.param(['On(Robot, Ladder)', 'Dry(Ladder)', 'Painted(Ceiling)'], 'paint-ceiling', id="paint_already_painted_ceiling"),
+    # with invalid robot position
+    pytest.param(['On(Robot, Invalid)', 'Dry(Ladder)', 'Dry(Ceiling)'], 'climb-ladder', id="invalid_robot_position"),
+    # painting ladder while robot is on floor - (note: same as climb-ladder, may be a bug)
+    pytest.param(ROBOT_START, 'paint-ladder', id="paint_ladder_from_floor"),
+]
+
+# (start conditions, goal conditions) for create_plan on the robot problem
+PLAN_CASES = [
+    # create_plan to paint ceiling from floor
+    pytest.param(ROBOT_START, PAINT_GOAL, id="create_plan_paint_ceiling"),
+    # create_plan with invalid start conditions
+    pytest.param(['Invalid(Condition)'], PAINT_GOAL, id="create_plan_invalid_start_conditions"),
+    # create_plan with multiple goals (ceiling and ladder) - creates multiple plans
+    pytest.param(ROBOT_START, MULTI_GOAL, id="create_plan_multiple_goals"),
+    # create_plan when robot starts on ladder and needs to paint ladder - should descend first
+    pytest.param(_LADDER_DRY, ['Painted(Ladder)'], id="create_plan_robot_on_ladder_paint_ladder"),
+    # creating plan to paint ladder only
+    pytest.param(ROBOT_START, ['Painted(Ladder)'], id="create_plan_paint_ladder"),
+]
 
 
 class TestPlanningFunctions:
@@ -12,6 +64,8 @@ class TestPlanningFunctions:
 
     def test_planner_instantiation(self):
         """Test that RobotPaintingPlanner can be instantiated and loads operators"""
+        from pop_solver.planning.planner.instances.robot_painting_planner import RobotPaintingPlanner
+
         planner = RobotPaintingPlanner()
 
         # Check that operators are loaded
@@ -23,127 +77,41 @@ class TestPlanningFunctions:
         for op in expected_operators:
             assert op in planner.operators
 
-    def test_apply_operator_climb_ladder(self):
-        """Test apply_operator with climb-ladder (actual output)"""
-        result = apply_operator(
-            ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            'climb-ladder',
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "The result of applying the 'climb-ladder' operator to start state 'On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder)' is the resulting state 'On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder)'"
-        assert result == expected
-
-    def test_apply_operator_missing_ceiling_condition(self):
-        """Test apply_operator with missing ceiling condition"""
-        result = apply_operator(
-            ['On(Robot, Floor)', 'Dry(Ladder)'],
-            'climb-ladder',
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "Error: The start state conditions are invalid: Missing ceiling status condition. Must specify at least one ceiling condition (e.g., 'Dry(Ceiling)')."
-        assert result == expected
+    def test_planners_share_loaded_operators(self):
+        """Test operator definitions are parsed once and shared between planner instances"""
+        from pop_solver.planning.planner.instances.robot_painting_planner import RobotPaintingPlanner
 
-    def test_apply_operator_invalid_operator(self):
-        """Test apply_operator with invalid operator"""
-        result = apply_operator(
-            ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            'invalid-operator',
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "Error: Operator not valid for robot problem instance. Please resubmit tool call with the operator parameter set to a valid option from this list in the correct format: ['climb-ladder', 'descend-ladder', 'paint-ceiling', 'paint-ladder']"
-        assert result == expected
-
-    def test_create_plan_paint_ceiling(self):
-        """Test create_plan to paint ceiling from floor"""
-        result = create_plan(
-            ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            ['Painted(Ceiling)'],
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "[Plan(goal=Painted(Ceiling), operator_steps=[Operator(name=climb-ladder, preconditions=['On(Robot, Floor)', 'Dry(Ladder)'], postconditions=['On(Robot, Ladder)']), Operator(name=paint-ceiling, preconditions=['On(Robot, Ladder)'], postconditions=['Painted(Ceiling)', '¬Dry(Ceiling)'])], state_steps=[On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder), On(Robot, Ladder) ^ Dry(Ceiling) ^ Dry(Ladder), On(Robot, Ladder) ^ Painted(Ceiling) ^ ¬Dry(Ceiling) ^ Dry(Ladder)])]"
-        assert result == expected
-
-    def test_create_plan_invalid_start_conditions(self):
-        """Test create_plan with invalid start conditions"""
-        result = create_plan(
-            ['Invalid(Condition)'],
-            ['Painted(Ceiling)'],
-            'robot'
-        )
+        first = RobotPaintingPlanner()
+        second = RobotPaintingPlanner()
 
-        # Based on actual function output
-        expected = "Error: The start state conditions are invalid: Unknown condition 'Invalid(Condition)'."
-        assert result == expected
+        # Each planner owns its table, but the operators themselves are reused
+        assert first.operators is not second.operators
+        assert first.operators['climb-ladder'] is second.operators['climb-ladder']
 
     def test_create_plan_invalid_goal_conditions(self):
         """Test create_plan with invalid goal conditions - should raise exception"""
         # This test expects an exception to be raised
-        with pytest.raises(LookupError, match=r"No operator found with postconditions matching the goal condition 'Invalid\(Goal\)'."):
+        with pytest.raises(LookupError) as excinfo:
             create_plan(
-                ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
+                ROBOT_START,
                 ['Invalid(Goal)'],
                 'robot'
             )
+        excinfo.match(_INVALID_GOAL_RE)
 
 
-class TestAllOperators:
-    """Test all available operators"""
-
-    def test_apply_descend_ladder(self):
-        """Test descend-ladder operator"""
-        result = apply_operator(
-            ['On(Robot, Ladder)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            'descend-ladder',
-            'robot'
-        )
-
-        # Based on actual function output (note: state not updating, potential bug)
-        expected = "The result of applying the 'descend-ladder' operator to start state 'On(Robot, Ladder) ^ Dry(Ceiling) ^ Dry(Ladder)' is the resulting state 'On(Robot, Ladder) ^ Dry(Ceiling) ^ Dry(Ladder)'"
-        assert result == expected
+class TestRobotPlanningCases:
+    """Table-driven apply_operator and create_plan cases for the robot problem"""
 
-    def test_apply_paint_ceiling_from_ladder(self):
-        """Test paint-ceiling operator from ladder (should work)"""
-        result = apply_operator(
-            ['On(Robot, Ladder)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            'paint-ceiling',
-            'robot'
-        )
+    @pytest.mark.parametrize("start_conditions,operator", APPLY_CASES)
+    def test_apply_operator(self, start_conditions, operator, snapshot):
+        """Test apply_operator output for each start state and operator"""
+        assert apply_operator(start_conditions, operator, 'robot') == snapshot
 
-        # Based on actual function output
-        expected = "The result of applying the 'paint-ceiling' operator to start state 'On(Robot, Ladder) ^ Dry(Ceiling) ^ Dry(Ladder)' is the resulting state 'On(Robot, Ladder) ^ Dry(Ceiling) ^ Dry(Ladder)'"
-        assert result == expected
-
-    def test_apply_paint_ceiling_from_floor(self):
-        """Test paint-ceiling operator from floor (should fail)"""
-        result = apply_operator(
-            ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            'paint-ceiling',
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "The provided operator 'paint-ceiling' cannot be applied to start state 'On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder)' for the following reason: Precondition 'On(Robot, Ladder)' is not met."
-        assert result == expected
-
-    def test_apply_climb_when_on_ladder(self):
-        """Test climb-ladder when robot already on ladder (should fail)"""
-        result = apply_operator(
-            ['On(Robot, Ladder)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            'climb-ladder',
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "The provided operator 'climb-ladder' cannot be applied to start state 'On(Robot, Ladder) ^ Dry(Ceiling) ^ Dry(Ladder)' for the following reason: Precondition 'On(Robot, Floor)' is not met."
-        assert result == expected
+    @pytest.mark.parametrize("start_conditions,goal_conditions", PLAN_CASES)
+    def test_create_plan(self, start_conditions, goal_conditions, snapshot):
+        """Test create_plan output for each start state and goal"""
+        assert create_plan(start_conditions, goal_conditions, 'robot') == snapshot
 
 
 class TestProblemTypes:
@@ -153,7 +121,7 @@ class TestProblemTypes:
         """Test apply_operator with blockworld type (should fail)"""
         with pytest.raises(ValueError, match="Blockworld planner not implemented"):
             apply_operator(
-                ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
+                ROBOT_START,
                 'climb-ladder',
                 'blockworld'
             )
@@ -161,131 +129,11 @@ class TestProblemTypes:
     def test_create_plan_blockworld_type(self):
         """Test create_plan with blockworld type (should fail gracefully)"""
         result = create_plan(
-            ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            ['Painted(Ceiling)'],
+            ROBOT_START,
+            PAINT_GOAL,
             'blockworld'
         )
 
         # Based on actual function output
         expected = "Error: Blockworld planner not implemented"
         assert result == expected
-
-
-class TestComplexScenarios:
-    """Test complex planning scenarios"""
-
-    def test_create_plan_multiple_goals(self):
-        """Test create_plan with multiple goals (ceiling and ladder)"""
-        result = create_plan(
-            ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            ['Painted(Ceiling)', 'Painted(Ladder)'],
-            'robot'
-        )
-
-        # Based on actual function output - creates multiple plans
-        expected = "[Plan(goal=Painted(Ceiling), operator_steps=[Operator(name=climb-ladder, preconditions=['On(Robot, Floor)', 'Dry(Ladder)'], postconditions=['On(Robot, Ladder)']), Operator(name=paint-ceiling, preconditions=['On(Robot, Ladder)'], postconditions=['Painted(Ceiling)', '¬Dry(Ceiling)'])], state_steps=[On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder), On(Robot, Ladder) ^ Dry(Ceiling) ^ Dry(Ladder), On(Robot, Ladder) ^ Painted(Ceiling) ^ ¬Dry(Ceiling) ^ Dry(Ladder)]), Plan(goal=On(Robot, Floor), operator_steps=[Operator(name=descend-ladder, preconditions=['On(Robot, Ladder)', 'Dry(Ladder)'], postconditions=['On(Robot, Floor)'])], state_steps=[On(Robot, Ladder) ^ Painted(Ceiling) ^ ¬Dry(Ceiling) ^ Dry(Ladder), On(Robot, Floor) ^ Painted(Ceiling) ^ ¬Dry(Ceiling) ^ Dry(Ladder)]), Plan(goal=Painted(Ladder), operator_steps=[Operator(name=paint-ladder, preconditions=['On(Robot, Floor)'], postconditions=['Painted(Ladder)', '¬Dry(Ladder)'])], state_steps=[On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder), On(Robot, Floor) ^ Dry(Ceiling) ^ Painted(Ladder) ^ ¬Dry(Ladder)])]"
-        assert result == expected
-
-    def test_create_plan_robot_on_ladder_paint_ladder(self):
-        """Test create_plan when robot starts on ladder and needs to paint ladder"""
-        result = create_plan(
-            ['On(Robot, Ladder)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            ['Painted(Ladder)'],
-            'robot'
-        )
-
-        # Based on actual function output - should descend first
-        expected = "[Plan(goal=Painted(Ladder), operator_steps=[Operator(name=descend-ladder, preconditions=['On(Robot, Ladder)', 'Dry(Ladder)'], postconditions=['On(Robot, Floor)']), Operator(name=paint-ladder, preconditions=['On(Robot, Floor)'], postconditions=['Painted(Ladder)', '¬Dry(Ladder)'])], state_steps=[On(Robot, Ladder) ^ Dry(Ceiling) ^ Dry(Ladder), On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder), On(Robot, Floor) ^ Dry(Ceiling) ^ Painted(Ladder) ^ ¬Dry(Ladder)])]"
-        assert result == expected
-
-
-class TestEdgeCases:
-    """Test edge cases and boundary conditions"""
-
-    def test_climb_painted_ladder(self):
-        """Test climbing painted ladder (should fail)"""
-        result = apply_operator(
-            ['On(Robot, Floor)', 'Painted(Ladder)', 'Dry(Ceiling)'],
-            'climb-ladder',
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "The provided operator 'climb-ladder' cannot be applied to start state 'On(Robot, Floor) ^ Dry(Ceiling) ^ Painted(Ladder) ^ ¬Dry(Ladder)' for the following reason: Precondition 'Dry(Ladder)' is not met."
-        assert result == expected
-
-    def test_climb_not_dry_ladder(self):
-        """Test climbing ladder that is not dry (should fail)"""
-        result = apply_operator(
-            ['On(Robot, Floor)', '¬Dry(Ladder)', 'Dry(Ceiling)'],
-            'climb-ladder',
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "The provided operator 'climb-ladder' cannot be applied to start state 'On(Robot, Floor) ^ Dry(Ceiling) ^ Painted(Ladder) ^ ¬Dry(Ladder)' for the following reason: Precondition 'Dry(Ladder)' is not met."
-        assert result == expected
-
-    def test_descend_painted_ladder(self):
-        """Test descending painted ladder (should fail)"""
-        result = apply_operator(
-            ['On(Robot, Ladder)', 'Painted(Ladder)', 'Dry(Ceiling)'],
-            'descend-ladder',
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "The provided operator 'descend-ladder' cannot be applied to start state 'On(Robot, Ladder) ^ Dry(Ceiling) ^ Painted(Ladder) ^ ¬Dry(Ladder)' for the following reason: Precondition 'Dry(Ladder)' is not met."
-        assert result == expected
-
-    def test_paint_already_painted_ceiling(self):
-        """Test painting ceiling that is already painted"""
-        result = apply_operator(
-            ['On(Robot, Ladder)', 'Dry(Ladder)', 'Painted(Ceiling)'],
-            'paint-ceiling',
-            'robot'
-        )
-
-        # Based on actual function output - allows repainting
-        expected = "The result of applying the 'paint-ceiling' operator to start state 'On(Robot, Ladder) ^ Painted(Ceiling) ^ ¬Dry(Ceiling) ^ Dry(Ladder)' is the resulting state 'On(Robot, Ladder) ^ Painted(Ceiling) ^ ¬Dry(Ceiling) ^ Dry(Ladder)'"
-        assert result == expected
-
-    def test_invalid_robot_position(self):
-        """Test with invalid robot position"""
-        result = apply_operator(
-            ['On(Robot, Invalid)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            'climb-ladder',
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "Error: The start state conditions are invalid: Invalid 'On(Robot, ...)' condition. Must be 'On(Robot, Floor)' or 'On(Robot, Ladder)'."
-        assert result == expected
-
-
-class TestRobotPaintingScenarios:
-    """Test specific robot painting scenarios"""
-
-    def test_paint_ladder_from_floor(self):
-        """Test painting ladder while robot is on floor"""
-        result = apply_operator(
-            ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            'paint-ladder',
-            'robot'
-        )
-
-        # Based on actual function output (note: same as climb-ladder, may be a bug)
-        expected = "The result of applying the 'paint-ladder' operator to start state 'On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder)' is the resulting state 'On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder)'"
-        assert result == expected
-
-    def test_create_plan_paint_ladder(self):
-        """Test creating plan to paint ladder only"""
-        result = create_plan(
-            ['On(Robot, Floor)', 'Dry(Ladder)', 'Dry(Ceiling)'],
-            ['Painted(Ladder)'],
-            'robot'
-        )
-
-        # Based on actual function output
-        expected = "[Plan(goal=Painted(Ladder), operator_steps=[Operator(name=paint-ladder, preconditions=['On(Robot, Floor)'], postconditions=['Painted(Ladder)', '¬Dry(Ladder)'])], state_steps=[On(Robot, Floor) ^ Dry(Ceiling) ^ Dry(Ladder), On(Robot, Floor) ^ Dry(Ceiling) ^ Painted(Ladder) ^ ¬Dry(Ladder)])]"
-        assert result == expected
\ No newline at end of file